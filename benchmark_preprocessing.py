@@ -0,0 +1,30 @@
+# benchmark_preprocessing.py
+import time
+from models.preprocessing import normalize, preprocess_uncached
+
+sample_texts = [
+    "நான் பள்ளிக்கு செல்கிறேன்.",
+    "நாங்கள் பள்ளிக்கு செல்கிறான் சல்கிறேன்.",
+    "நேற்று நான் பள்ளிக்கு செல்கிறேன். இன்று நண்பர்களுடன் விளையாட வந்தேன்!",
+    "அவன் நல்ல புத்தகத்தெ எழுதினான் ஆனா யாரும் படிக்கவில்லை?",
+    "கெளரவம் மிக்க ஆசிரியர் நல்ல பாடங்களை கற்றுக் கொடுக்கிறார்।",
+]
+
+# Benchmark function
+def run_benchmark(size_mb=8, repeats=3):
+    chunk = ' '.join(sample_texts) + ' '
+    copies = int(size_mb * 1024 * 1024 / len(chunk.encode('utf-8'))) + 1
+    text = chunk * copies
+    megabytes = len(text.encode('utf-8')) / (1024 * 1024)
+    print(f"Input size: {megabytes:.1f} MB\n")
+
+    for name, func in [('normalize', normalize), ('preprocess', preprocess_uncached)]:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func(text)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name}: {megabytes / best:.1f} MB/s")
+
+if __name__ == "__main__":
+    run_benchmark()
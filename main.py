@@ -5,14 +5,23 @@ from models.rule_based_model import RuleBasedChecker
 from models.statistical_model import StatisticalChecker
 from models.deep_learning_model import DeepLearningChecker
 from models.google_gemma_model import GemmaChecker
+from models.preprocessing import preprocess_uncached
 
-def compare_models(text):
-    models = {
+def load_models():
+    return {
         'Rule-based': RuleBasedChecker(),
         'Statistical': StatisticalChecker(),
         'Deep Learning': DeepLearningChecker(),
         'Gemma': GemmaChecker()
     }
+
+def compare_models(text, models=None):
+    # Reuse already loaded models (e.g. shared by pre-forked workers) when given
+    if models is None:
+        models = load_models()
+    
+    # Preprocess once and share the document with every checker
+    document = preprocess_uncached(text)
     
     results = {}
     suggestions = {}
@@ -20,13 +29,13 @@ def compare_models(text):
     for model_name, model in models.items():
         try:
             if model_name == 'Deep Learning':
-                errors = model.check_text(text)
-                suggestions[model_name] = model.get_correction_suggestions(text)
+                errors = model.check_text(document)
+                suggestions[model_name] = model.get_correction_suggestions(document)
             elif model_name == 'Gemma':
-                suggestions[model_name] = model.get_suggestions(text)
-                errors = model.check_text(text)
+                suggestions[model_name] = model.get_suggestions(document)
+                errors = model.check_text(document)
             else:
-                errors = model.check_text(text)
+                errors = model.check_text(document)
             
             results[model_name] = errors
         except Exception as e:
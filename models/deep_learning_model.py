@@ -1,12 +1,25 @@
 # models/deep_learning_model.py
 import torch
 from transformers import AutoTokenizer, AutoModelForMaskedLM
+import Levenshtein
 import warnings
-from typing import List, Tuple
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
 import re
+from models.preprocessing import Document, dictionary_key, normalize, preprocess, source_text
 
 class DeepLearningChecker:
-    def __init__(self):
+    # Maximum number of (context, word) MLM results kept per checker
+    mlm_cache_size = 4096
+
+    def __init__(self, top_k: int = 20, max_edit_distance: int = 2):
+        # Correction candidate settings
+        self.top_k = top_k
+        self.max_edit_distance = max_edit_distance
+        
+        # Bounded LRU cache of MLM results: (masked_text, word) -> (prob, top-k predictions)
+        self._mlm_cache: OrderedDict = OrderedDict()
+        
         # Suppress warnings during model initialization
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore')
@@ -26,6 +39,9 @@ class DeepLearningChecker:
             
             # Load Tamil word dictionary
             self._load_tamil_dictionary()
+            
+            # Load lexicon used to filter correction candidates
+            self._load_lexicon()
 
     def _load_tamil_dictionary(self):
         """Load basic Tamil dictionary"""
@@ -68,36 +84,93 @@ class DeepLearningChecker:
             ]
         }
 
-    def _assess_word_probability(self, text: str) -> List[Tuple[str, float]]:
-        """Assess the probability of each word using MLM"""
+    def _load_lexicon(self):
+        """Load the whole-word list used to validate correction candidates"""
+        self.lexicon = set()
+        
+        try:
+            with open("data/tamil_words.txt", "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        self.lexicon.add(dictionary_key(line.strip()))
+        except FileNotFoundError:
+            pass  # Use the basic dictionary if file not found
+
+    def _predict_masked_word(self, words: List[str], i: int) -> Optional[Tuple[float, List[Tuple[str, float]]]]:
+        """Run one MLM pass with word i masked, returning its probability and the top-k predictions"""
+        word = words[i]
+        masked_text = ' '.join(words[:i] + ['[MASK]'] + words[i+1:])
+        cache_key = (masked_text, word)
+        if cache_key in self._mlm_cache:
+            self._mlm_cache.move_to_end(cache_key)
+            return self._mlm_cache[cache_key]
+
+        inputs = self.tokenizer(masked_text, return_tensors='pt', padding=True, truncation=True)
+        
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            predictions = outputs.logits
+            
+        masked_index = (inputs.input_ids == self.tokenizer.mask_token_id)[0].nonzero(as_tuple=True)[0]
+        if len(masked_index) == 0:
+            return None
+
+        # Get the probability of the actual word
+        probs = torch.softmax(predictions[0, masked_index], dim=-1)[0]
+        word_id = self.tokenizer.convert_tokens_to_ids(word)
+        word_prob = probs[word_id].item()
+        
+        # Keep the top-k predictions from the same forward pass as candidates
+        top_probs, top_ids = torch.topk(probs, self.top_k)
+        top_tokens = self.tokenizer.convert_ids_to_tokens(top_ids.tolist())
+        special_tokens = set(self.tokenizer.all_special_tokens)
+        top_predictions = [
+            (normalize(token), prob)
+            for token, prob in zip(top_tokens, top_probs.tolist())
+            # WordPiece continuations (##...) and special tokens are never whole-word candidates
+            if token not in special_tokens and not token.startswith('##')
+        ]
+
+        result = (word_prob, top_predictions)
+        self._mlm_cache[cache_key] = result
+        if len(self._mlm_cache) > self.mlm_cache_size:
+            self._mlm_cache.popitem(last=False)
+        return result
+
+    def _score_words(self, words: List[str]) -> List[Tuple[str, float, List[Tuple[str, float]]]]:
+        """Score each word using MLM, keeping the top-k predictions for its position"""
         if self.model is None or self.tokenizer is None:
             return []
 
         try:
-            words = text.split()
             word_scores = []
 
             for i, word in enumerate(words):
-                # Create input with current word masked
-                masked_text = ' '.join(words[:i] + ['[MASK]'] + words[i+1:])
-                inputs = self.tokenizer(masked_text, return_tensors='pt', padding=True, truncation=True)
-                
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    predictions = outputs.logits
-                    
-                # Get the probability of the actual word
-                masked_index = (inputs.input_ids == self.tokenizer.mask_token_id)[0].nonzero(as_tuple=True)[0]
-                if len(masked_index) > 0:
-                    word_id = self.tokenizer.convert_tokens_to_ids(word)
-                    word_prob = torch.softmax(predictions[0, masked_index], dim=-1)[0, word_id].item()
-                    word_scores.append((word, word_prob))
+                result = self._predict_masked_word(words, i)
+                if result is not None:
+                    word_prob, top_predictions = result
+                    word_scores.append((word, word_prob, top_predictions))
 
             return word_scores
         except Exception as e:
             print(f"Word probability assessment error: {str(e)}")
             return []
 
+    def _rank_candidates(self, word: str, top_predictions: List[Tuple[str, float]]) -> List[str]:
+        """Keep MLM predictions that are lexicon words close to the typed word and rerank them"""
+        scored = {}
+        
+        for token, prob in top_predictions:
+            if dictionary_key(token) not in self.lexicon:
+                continue
+            distance = Levenshtein.distance(word, token)
+            if 0 < distance <= self.max_edit_distance:
+                # Favour likely predictions that are close to what was typed
+                score = prob / (1 + distance)
+                scored[token] = max(score, scored.get(token, 0.0))
+        
+        return sorted(scored, key=scored.get, reverse=True)
+
     def _check_patterns(self, text: str) -> List[Tuple[str, str, str]]:
         """Check text against Tamil patterns"""
         errors = []
@@ -115,43 +188,36 @@ class DeepLearningChecker:
         
         return errors
 
-    def _split_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
-        return [s.strip() for s in re.split('[.!?।]', text) if s.strip()]
-
-    def check_text(self, text: str) -> List[Tuple[str, str, str]]:
+    def check_text(self, text: Union[str, Document]) -> List[Tuple[str, str, str]]:
         """Check text for errors using MLM and pattern matching"""
         try:
             errors = []
-            sentences = self._split_sentences(text)
             
-            for sentence in sentences:
+            for sentence in preprocess(text).sentences:
                 # Check using patterns
-                pattern_errors = self._check_patterns(sentence)
+                pattern_errors = self._check_patterns(sentence.text)
                 errors.extend(pattern_errors)
                 
                 # Check word probabilities if model is available
-                word_scores = self._assess_word_probability(sentence)
-                for word, prob in word_scores:
+                word_scores = self._score_words(list(sentence.words))
+                for word, prob, _ in word_scores:
                     if prob < 0.1:  # Low probability threshold
-                        errors.append(('spelling', f'Unusual word detected: "{word}" (confidence: {prob:.2%})', sentence))
+                        errors.append(('spelling', f'Unusual word detected: "{word}" (confidence: {prob:.2%})', sentence.text))
             
             return errors if errors else []
             
         except Exception as e:
-            return [('error', f'Error in analysis: {str(e)}', text)]
+            return [('error', f'Error in analysis: {str(e)}', source_text(text))]
 
-    def get_correction_suggestions(self, text: str) -> List[str]:
+    def get_correction_suggestions(self, text: Union[str, Document]) -> List[str]:
         """Get correction suggestions for the text"""
         suggestions = []
         try:
-            sentences = self._split_sentences(text)
-            
-            for sentence in sentences:
+            for sentence in preprocess(text).sentences:
                 # Get pattern-based suggestions
                 for error_type, patterns in self.tamil_patterns.items():
                     for pattern, correction in patterns:
-                        if re.search(pattern, sentence):
+                        if re.search(pattern, sentence.text):
                             if error_type == 'spelling':
                                 suggestions.append(f"Spelling suggestion: Replace '{pattern}' with '{correction}'")
                             elif error_type == 'grammar':
@@ -160,10 +226,15 @@ class DeepLearningChecker:
                                 suggestions.append(f"Format suggestion: {correction}")
                 
                 # Add MLM-based suggestions if available
-                word_scores = self._assess_word_probability(sentence)
-                for word, prob in word_scores:
+                word_scores = self._score_words(list(sentence.words))
+                for word, prob, top_predictions in word_scores:
                     if prob < 0.1:
-                        suggestions.append(f"Unusual word detected: '{word}' might need review")
+                        candidates = self._rank_candidates(word, top_predictions)
+                        if candidates:
+                            alternatives = ', '.join(f"'{c}'" for c in candidates[:3])
+                            suggestions.append(f"Spelling suggestion: Replace '{word}' with {alternatives}")
+                        else:
+                            suggestions.append(f"Unusual word detected: '{word}' might need review")
             
             return suggestions if suggestions else ["No specific corrections needed."]
             
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
 from groq import Groq
+from models.preprocessing import preprocess, source_text
 
 load_dotenv()
 
@@ -12,6 +13,7 @@ class GemmaChecker:
         self.client = Groq(api_key=api_key)
 
     def get_suggestions(self, tamil_text):
+        tamil_text = preprocess(tamil_text).text
         prompt = f"""
         As a Tamil language expert, analyze the following text for spelling and grammatical errors.
         Provide detailed corrections and suggestions in Tamil:
@@ -48,10 +50,11 @@ class GemmaChecker:
             return f"Error getting suggestions: {str(e)}"
 
     def check_text(self, text):
+        context = source_text(text)
         try:
             suggestions = self.get_suggestions(text)
             if suggestions.startswith("Error"):
-                return [("error", suggestions, text)]
-            return [("info", suggestions, text)]
+                return [("error", suggestions, context)]
+            return [("info", suggestions, context)]
         except Exception as e:
-            return [("error", f"Error checking text: {str(e)}", text)]
\ No newline at end of file
+            return [("error", f"Error checking text: {str(e)}", context)]
\ No newline at end of file
@@ -0,0 +1,238 @@
+# models/preprocessing.py
+import re
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+from typing import NamedTuple, Tuple, Union
+
+# Invisible characters that make identical-looking spellings compare unequal:
+# zero width space, non-joiner, joiner, word joiner, byte order mark and soft hyphen.
+# A zero width space still separates words, so it becomes a plain space.
+_INVISIBLE_RE = re.compile('[\u200b-\u200d\u2060\ufeff\u00ad]')
+_INVISIBLE_REPLACEMENTS = {'\u200b': ' '}
+
+# Text made only of ASCII and Tamil can skip the generic NFC pass, since the
+# only Tamil canonical compositions are the two-part vowel signs and ஔ
+_NON_TAMIL_RE = re.compile('[^\x00-\x7f\u0b80-\u0bff\u0964\u0965]')
+_TAMIL_COMPOSITIONS = {unicodedata.normalize('NFD', char): char for char in 'ஔொோௌ'}
+_TAMIL_COMPOSE_RE = re.compile('|'.join(_TAMIL_COMPOSITIONS))
+
+# ASCII characters never compose with what precedes them, so NFC can be applied
+# to each run of non-ASCII text (with the ASCII character before it) separately
+_NFC_CHUNK_RE = re.compile('[\x00-\x7f]?[^\x00-\x7f]+')
+
+# Tamil dependent vowel signs, anusvara and the au length mark
+_TAMIL_MARKS = '\u0b82\u0bbe-\u0bcd\u0bd7'
+
+# ௌ typed as ெ + ள (the consonant looks like the au length mark)
+_AU_SIGN_RE = re.compile('ெள(?![' + _TAMIL_MARKS + '])')
+_SENTENCE_RE = re.compile(r'[^.!?।]+')
+_WORD_RE = re.compile(r'[\w' + _TAMIL_MARKS + r']+')
+_GRAPHEME_RE = re.compile(r'.[' + _TAMIL_MARKS + r']*', re.DOTALL)
+
+# Inputs longer than this are not kept in the preprocess cache
+_CACHE_MAX_CHARS = 16384
+
+
+class OffsetMap(NamedTuple):
+    """Breakpoints mapping offsets after one rewrite pass back to offsets before it"""
+    starts: Tuple[int, ...]
+    source_starts: Tuple[int, ...]
+    steps: Tuple[int, ...]
+
+    def source_offset(self, offset: int) -> int:
+        i = bisect_right(self.starts, offset) - 1
+        if i < 0:
+            return offset
+        # Characters inside a replacement (step 0) map to the start of what they replaced
+        return self.source_starts[i] + self.steps[i] * (offset - self.starts[i])
+
+
+class Token(NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+class Sentence(NamedTuple):
+    text: str
+    start: int
+    end: int
+    tokens: Tuple[Token, ...]
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        return tuple(token.text for token in self.tokens)
+
+
+class Document(NamedTuple):
+    """A preprocessed document.
+
+    Token, sentence and grapheme offsets refer to the normalized ``text``;
+    ``source_span`` maps them back to the caller's original ``source``.
+    """
+    source: str
+    text: str
+    sentences: Tuple[Sentence, ...]
+    grapheme_starts: Tuple[int, ...]
+    offset_maps: Tuple[OffsetMap, ...]
+
+    @property
+    def tokens(self) -> Tuple[Token, ...]:
+        return tuple(token for sentence in self.sentences for token in sentence.tokens)
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        return tuple(token.text for token in self.tokens)
+
+    def source_offset(self, offset: int) -> int:
+        """Offset in the original input for an offset in the normalized text"""
+        for offset_map in reversed(self.offset_maps):
+            offset = offset_map.source_offset(offset)
+        return offset
+
+    def source_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Span in the original input for a span in the normalized text"""
+        return self.source_offset(start), self.source_offset(end)
+
+    def grapheme_index(self, offset: int) -> int:
+        """Index of the grapheme cluster containing the given normalized-text offset"""
+        return bisect_right(self.grapheme_starts, offset) - 1
+
+    def grapheme_span(self, index: int) -> Tuple[int, int]:
+        """Normalized-text offsets of the grapheme cluster at the given index"""
+        start = self.grapheme_starts[index]
+        end = self.grapheme_starts[index + 1] if index + 1 < len(self.grapheme_starts) else len(self.text)
+        return start, end
+
+
+def _rewrite(pattern, replace, text: str) -> Tuple[str, OffsetMap]:
+    """Replace every match of pattern, recording how offsets move"""
+    parts = []
+    starts, source_starts, steps = [], [], []
+    last = 0
+    length = 0
+
+    for match in pattern.finditer(text):
+        old = match.group()
+        new = replace(old)
+        if new == old:
+            continue
+
+        # Only the part that actually differs is treated as replaced
+        start, end = match.span()
+        prefix = len(_common_prefix(old, new))
+        suffix = len(_common_prefix(old[prefix:][::-1], new[prefix:][::-1]))
+        start += prefix
+        end -= suffix
+        new = new[prefix:len(new) - suffix]
+
+        parts.append(text[last:start])
+        length += start - last
+        if new:
+            starts.append(length)
+            source_starts.append(start)
+            steps.append(0)
+            parts.append(new)
+            length += len(new)
+        starts.append(length)
+        source_starts.append(end)
+        steps.append(1)
+        last = end
+
+    if not starts:
+        return text, OffsetMap((), (), ())
+
+    parts.append(text[last:])
+    return ''.join(parts), OffsetMap(tuple(starts), tuple(source_starts), tuple(steps))
+
+
+def _common_prefix(a: str, b: str) -> str:
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    return a[:i]
+
+
+def _normalize(text: str) -> Tuple[str, Tuple[OffsetMap, ...]]:
+    offset_maps = []
+
+    if _INVISIBLE_RE.search(text):
+        text, offset_map = _rewrite(_INVISIBLE_RE, lambda char: _INVISIBLE_REPLACEMENTS.get(char, ''), text)
+        offset_maps.append(offset_map)
+
+    if _NON_TAMIL_RE.search(text):
+        text, offset_map = _rewrite(_NFC_CHUNK_RE, lambda chunk: unicodedata.normalize('NFC', chunk), text)
+    else:
+        text, offset_map = _rewrite(_TAMIL_COMPOSE_RE, _TAMIL_COMPOSITIONS.__getitem__, text)
+    offset_maps.append(offset_map)
+
+    return text, tuple(offset_maps)
+
+
+def normalize(text: str) -> str:
+    """Apply NFC and drop invisible characters; the text is otherwise unchanged"""
+    return _normalize(text)[0]
+
+
+def dictionary_key(word: str) -> str:
+    """Lookup key for dictionary and lexicon entries.
+
+    Besides normalizing, this also folds ௌ typed as ெ + ள. That spelling is
+    a different text, so it is only used for lookups and never for the
+    text shown to users.
+    """
+    return _AU_SIGN_RE.sub('ௌ', normalize(word))
+
+
+def graphemes(text: str) -> Tuple[str, ...]:
+    """Split text into Tamil grapheme clusters (letter plus its vowel signs)"""
+    return tuple(_GRAPHEME_RE.findall(text))
+
+
+def _segment(text: str) -> Tuple[Sentence, ...]:
+    sentences = []
+
+    for match in _SENTENCE_RE.finditer(text):
+        raw = match.group()
+        stripped = raw.strip()
+        if not stripped:
+            continue
+
+        start = match.start() + (len(raw) - len(raw.lstrip()))
+        end = start + len(stripped)
+        tokens = tuple([
+            Token(word.group(), word.start(), word.end())
+            for word in _WORD_RE.finditer(text, start, end)
+        ])
+        sentences.append(Sentence(stripped, start, end, tokens))
+
+    return tuple(sentences)
+
+
+def preprocess_uncached(text: str) -> Document:
+    """Normalize and segment a document without consulting the shared cache"""
+    normalized, offset_maps = _normalize(text)
+    grapheme_starts = tuple(map(re.Match.start, _GRAPHEME_RE.finditer(normalized)))
+    return Document(text, normalized, _segment(normalized), grapheme_starts, offset_maps)
+
+
+_preprocess_cached = lru_cache(maxsize=8)(preprocess_uncached)
+
+
+def preprocess(text: Union[str, Document]) -> Document:
+    """Normalize and segment a document, reusing one that is already preprocessed.
+
+    Callers that run several checkers should preprocess once and pass the
+    Document along; only short inputs are kept in the small shared cache.
+    """
+    if isinstance(text, Document):
+        return text
+    if len(text) > _CACHE_MAX_CHARS:
+        return preprocess_uncached(text)
+    return _preprocess_cached(text)
+
+
+def source_text(text: Union[str, Document]) -> str:
+    """The caller's original text for either a string or a Document"""
+    return text.source if isinstance(text, Document) else text
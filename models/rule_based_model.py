@@ -1,7 +1,7 @@
 # models/rule_based_model.py
 import re
-from indicnlp.tokenize.indic_tokenize import trivial_tokenize
 from collections import defaultdict
+from models.preprocessing import dictionary_key, preprocess, source_text
 
 class RuleBasedChecker:
     def __init__(self):
@@ -62,16 +62,16 @@ class RuleBasedChecker:
         except FileNotFoundError:
             pass  # Use the basic dictionary if file not found
             
-        return basic_dictionary
+        # Key entries the same way words are looked up
+        return {dictionary_key(word): word_type for word, word_type in basic_dictionary.items()}
 
     def split_sentences(self, text):
-        # Simple sentence splitting based on punctuation
-        sentences = re.split('[.!?।]', text)
-        return [s.strip() for s in sentences if s.strip()]
+        # Sentences come from the shared preprocessing stage
+        return [sentence.text for sentence in preprocess(text).sentences]
 
     def check_spelling(self, text):
         errors = []
-        words = trivial_tokenize(text)
+        words = preprocess(text).words
         
         for word in words:
             # Check spelling patterns
@@ -80,7 +80,7 @@ class RuleBasedChecker:
                     errors.append(('spelling', msg, word))
             
             # Check against dictionary
-            if word not in self.tamil_words and not any(char.isdigit() for char in word):
+            if dictionary_key(word) not in self.tamil_words and not any(char.isdigit() for char in word):
                 errors.append(('spelling', f'Unknown word: {word}', word))
             
             # Check word spacing
@@ -120,4 +120,4 @@ class RuleBasedChecker:
             return all_errors
             
         except Exception as e:
-            return [('error', f'Error in text analysis: {str(e)}', text)]
\ No newline at end of file
+            return [('error', f'Error in text analysis: {str(e)}', source_text(text))]
\ No newline at end of file
@@ -6,6 +6,7 @@ from sklearn.model_selection import train_test_split
 import numpy as np
 import re
 from collections import Counter
+from models.preprocessing import preprocess
 
 class StatisticalChecker:
     def __init__(self):
@@ -89,6 +90,7 @@ class StatisticalChecker:
 
     def check_text(self, text):
         try:
+            text = preprocess(text).text
             features = self._extract_features(text)
             
             # Get model predictions
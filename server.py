@@ -0,0 +1,225 @@
+# server.py
+import argparse
+import gc
+import json
+import os
+import signal
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import torch
+
+from main import compare_models, load_models
+
+# Models are loaded once in the parent and inherited by every forked worker
+MODELS = {}
+
+# Workers that exit sooner than this after starting are restarted with a growing delay
+MIN_WORKER_UPTIME = 5
+MAX_RESTART_DELAY = 30
+
+
+def freeze_models(models):
+    """Make loaded models read-only so forked workers keep sharing their pages"""
+    for model in models.values():
+        network = getattr(model, 'model', None)
+        if isinstance(network, torch.nn.Module):
+            network.eval()
+            network.requires_grad_(False)
+            share_weights(network)
+
+    # Keep the garbage collector from touching (and so copying) objects created so far
+    gc.collect()
+    gc.freeze()
+
+
+def share_weights(network):
+    """Move weights into shared memory, falling back to plain copy-on-write"""
+    needed = sum(t.numel() * t.element_size() for t in network.state_dict().values())
+    try:
+        stats = os.statvfs('/dev/shm')
+        available = stats.f_bavail * stats.f_frsize
+    except OSError:
+        available = 0
+
+    if available < needed:
+        print(f"Warning: /dev/shm has {available // 2**20} MB free but the weights need "
+              f"{needed // 2**20} MB; sharing them copy-on-write instead")
+        return
+
+    try:
+        network.share_memory()
+    except (RuntimeError, OSError) as e:
+        print(f"Warning: could not move weights to shared memory ({str(e)}); "
+              f"sharing them copy-on-write instead")
+
+
+def memory_usage(pid):
+    """Unique and shared memory of a process in kB, read from /proc"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as file:
+        for line in file:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+
+    return {
+        'pid': pid,
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'unique_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)
+    }
+
+
+class CheckerHandler(BaseHTTPRequestHandler):
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/memory':
+            self._send_json(200, memory_usage(os.getpid()))
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/check':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            text = json.loads(self.rfile.read(length))['text']
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f'Invalid request: {str(e)}'})
+            return
+
+        if not isinstance(text, str):
+            self._send_json(400, {'error': 'Invalid request: "text" must be a string'})
+            return
+
+        results, suggestions = compare_models(text, MODELS)
+        self._send_json(200, {'results': results, 'suggestions': suggestions})
+
+
+def print_memory_report(worker_pids):
+    print("Worker memory (kB):")
+    for pid in worker_pids:
+        try:
+            usage = memory_usage(pid)
+        except OSError:
+            # The worker exited since it was last reaped
+            continue
+        print(f"  pid {usage['pid']}: unique {usage['unique_kb']}, shared {usage['shared_kb']}, "
+              f"pss {usage['pss_kb']}, rss {usage['rss_kb']}")
+
+
+def run_worker(server, threads):
+    # Split cores between workers instead of every worker using all of them
+    torch.set_num_threads(threads)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        server.serve_forever()
+    except BaseException:
+        traceback.print_exc()
+        os._exit(1)
+    os._exit(0)
+
+
+def start_worker(server, threads):
+    pid = os.fork()
+    if pid == 0:
+        run_worker(server, threads)
+    return pid
+
+
+def serve(host, port, workers, threads, report_interval):
+    MODELS.update(load_models())
+    freeze_models(MODELS)
+
+    # Bind in the parent so all workers accept from the same listening socket
+    server = HTTPServer((host, port), CheckerHandler)
+    print(f"Serving on http://{host}:{port} with {workers} workers")
+
+    # Start time of each running worker, by pid
+    workers_started = {}
+    pending_restarts = []
+    restart_delay = 0
+    stopping = False
+
+    def spawn():
+        workers_started[start_worker(server, threads)] = time.monotonic()
+
+    for _ in range(workers):
+        spawn()
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers_started):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    next_report = time.monotonic()
+    while workers_started or (pending_restarts and not stopping):
+        # Reap exited workers before reading /proc for the memory report
+        while workers_started:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            started = workers_started.pop(pid, None)
+            if started is None or stopping:
+                continue
+
+            # Back off when workers keep dying right after they start
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                restart_delay = min(max(restart_delay * 2, 1), MAX_RESTART_DELAY)
+            else:
+                restart_delay = 0
+            print(f"Worker {pid} exited unexpectedly (status {os.waitstatus_to_exitcode(status)}); "
+                  f"restarting in {restart_delay}s")
+            pending_restarts.append(time.monotonic() + restart_delay)
+
+        # Replace lost workers from the frozen parent to keep capacity
+        now = time.monotonic()
+        if not stopping:
+            for due in [due for due in pending_restarts if due <= now]:
+                pending_restarts.remove(due)
+                spawn()
+
+        if report_interval > 0 and now >= next_report:
+            print_memory_report(list(workers_started))
+            next_report = now + report_interval
+
+        time.sleep(1)
+
+    server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Tamil text checkers from pre-forked workers")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=1, help="Torch threads per worker")
+    parser.add_argument('--report-interval', type=int, default=60,
+                        help="Seconds between memory reports (0 to disable)")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.threads, args.report_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# tests/test_deep_learning_model.py
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("Levenshtein")
+
+from models.deep_learning_model import DeepLearningChecker
+
+
+@pytest.fixture
+def checker():
+    # _rank_candidates needs only the lexicon and settings, not the MLM itself
+    checker = DeepLearningChecker.__new__(DeepLearningChecker)
+    checker.max_edit_distance = 2
+    checker.lexicon = {'செல்கிறேன்', 'செல்கிறான்', 'செல்கிறோம்', 'பள்ளிக்கு'}
+    return checker
+
+
+def test_rank_candidates_applies_edit_distance_cutoff(checker):
+    top_predictions = [('பள்ளிக்கு', 0.9), ('செல்கிறோம்', 0.5), ('செல்கிறேன்', 0.1)]
+    assert checker._rank_candidates('சல்கிறேன்', top_predictions) == ['செல்கிறேன்']
+
+
+def test_rank_candidates_excludes_typed_word(checker):
+    top_predictions = [('செல்கிறேன்', 0.9), ('செல்கிறான்', 0.05)]
+    assert checker._rank_candidates('செல்கிறேன்', top_predictions) == ['செல்கிறான்']
+
+
+def test_rank_candidates_orders_by_probability_over_distance(checker):
+    # Distance 1 at 0.3 scores 0.15; distance 2 at 0.4 scores 0.13
+    top_predictions = [('செல்கிறான்', 0.4), ('செல்கிறேன்', 0.3)]
+    assert checker._rank_candidates('சல்கிறேன்', top_predictions) == ['செல்கிறேன்', 'செல்கிறான்']
+
+
+def test_rank_candidates_skips_words_outside_lexicon(checker):
+    top_predictions = [('சல்கிறான்', 0.9), ('செல்கிறேன்', 0.1)]
+    assert checker._rank_candidates('சல்கிறேன்', top_predictions) == ['செல்கிறேன்']
@@ -0,0 +1,57 @@
+# tests/test_preprocessing.py
+import random
+import unicodedata
+
+from models.preprocessing import dictionary_key, graphemes, normalize, preprocess, preprocess_uncached
+
+
+def test_tamil_fast_path_matches_nfc():
+    alphabet = [chr(cp) for cp in range(0x0B80, 0x0C00)] + list('ab .\n')
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert normalize(text) == unicodedata.normalize('NFC', text)
+
+
+def test_mixed_script_matches_nfc():
+    text = 'café கொடு Ω क़'
+    assert normalize(text) == unicodedata.normalize('NFC', text)
+
+
+def test_normalize_does_not_fold_au_sign():
+    # ள is a different letter from the au length mark, so only lookups fold it
+    assert normalize('வெளக்கு') == 'வெளக்கு'
+    assert dictionary_key('கெளரவம்') == 'கௌரவம்'
+
+
+def test_sentences_and_words_with_offsets():
+    document = preprocess('நான் பள்ளிக்கு செல்கிறேன். இன்று வந்தேன்!')
+    assert [sentence.text for sentence in document.sentences] == [
+        'நான் பள்ளிக்கு செல்கிறேன்',
+        'இன்று வந்தேன்',
+    ]
+    assert document.words == ('நான்', 'பள்ளிக்கு', 'செல்கிறேன்', 'இன்று', 'வந்தேன்')
+    for token in document.tokens:
+        assert document.text[token.start:token.end] == token.text
+
+
+def test_offsets_map_back_to_source():
+    source = 'a\u200bநா\u200cன் கொடு'
+    document = preprocess_uncached(source)
+    assert document.words == ('a', 'நான்', 'கொடு')
+    spans = [document.source_span(token.start, token.end) for token in document.tokens]
+    assert [source[start:end] for start, end in spans] == ['a', 'நா\u200cன்', 'கொடு']
+
+
+def test_preprocess_reuses_document():
+    document = preprocess_uncached('நான் பள்ளிக்கு செல்கிறேன்')
+    assert preprocess(document) is document
+
+
+def test_grapheme_clusters():
+    assert graphemes('க்ஷ்') == ('க்', 'ஷ்')
+    assert graphemes('செல்கிறேன்') == ('செ', 'ல்', 'கி', 'றே', 'ன்')
+
+    document = preprocess('நான் செல்')
+    index = document.grapheme_index(7)
+    assert document.text[slice(*document.grapheme_span(index))] == 'ல்'